@@ -1,10 +1,13 @@
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import re
 import os
 import json
+import functools
 
-from config import ConversationPhase
+import ahocorasick
+
+from config import BudgetCondition, ConversationPhase, RETRIEVAL_CACHE_SIZE
 from phase_manager import PhaseManager
 from history import ConversationHistory
 from reasoning import Reasoning
@@ -14,6 +17,71 @@ from knowledge.retrieval import KnowledgeRetrieval
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Folds alef variants, ta marbuta and alef maqsura so spelling variants match the same keyword
+_NORMALIZE = str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ة': 'ه', 'ى': 'ي'})
+
+# === Keyword tables for basic info extraction ===
+_BASIC_INFO_FIELDS = ("location", "budget", "property_type")
+
+_LOCATIONS = frozenset({
+    "القاهرة", "الاسكندرية", "الجيزة", "المعادي", "مدينة نصر", "6 أكتوبر", "التجمع",
+    "الشروق", "العبور", "الرحاب", "مدينتي", "الشيخ زايد", "المهندسين", "الدقي",
+    "الزمالك", "وسط البلد", "مصر الجديدة", "حلوان"
+})
+
+_PROPERTY_TYPES = {
+    "شقة": ["شقة", "شقه", "apartment"],
+    "فيلا": ["فيلا", "فيلات", "villa"],
+    "دوبلكس": ["دوبلكس", "duplex"],
+    "ستوديو": ["ستوديو", "studio"],
+    "محل": ["محل", "محلات", "shop"],
+    "مكتب": ["مكتب", "مكاتب", "office"]
+}
+
+_BUDGET_RE = re.compile(r'(\d[\d,]*)\s*(جنيه|الف|مليون|k|m)')
+_DIGITS_RE = re.compile(r'\d+')
+
+# Condition names used by budget_advice entries in rules.json
+_BUDGET_CONDITIONS = {
+    "budget_high": BudgetCondition.HIGH,
+    "budget_mid": BudgetCondition.MID,
+    "budget_low": BudgetCondition.LOW,
+}
+
+# Vague references to a previously shown property, e.g. "هي مش عاجباني"
+_REF_RE = re.compile(r'(?:هي|ده|دي|العقار ده|العرض ده).*(?:مش|ما عجبني|ما عجباني|ما عجبها|ما حبيتها)')
+
+
+def _build_keyword_automaton() -> ahocorasick.Automaton:
+    """
+    Builds one Aho-Corasick automaton tagging locations and property types in a single pass.
+    Keys are normalized with _NORMALIZE; values keep the canonical spelling.
+    """
+    automaton = ahocorasick.Automaton()
+    for location in _LOCATIONS:
+        automaton.add_word(location.translate(_NORMALIZE).lower(), ("location", location))
+    for prop_type, keywords in _PROPERTY_TYPES.items():
+        for keyword in keywords:
+            automaton.add_word(keyword.translate(_NORMALIZE).lower(), ("property_type", prop_type))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AC = _build_keyword_automaton()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_rules() -> dict:
+    """Loads knowledge/rules.json once per process; the result is shared and must not be mutated."""
+    rules_path = os.path.join("knowledge", "rules.json")
+    if os.path.exists(rules_path):
+        with open(rules_path, encoding="utf-8") as f:
+            return json.load(f)
+    else:
+        logger.warning("rules.json not found.")
+        return {}
+
+
 class RealEstateAgent:
     def __init__(self, phase_manager: PhaseManager, conversation_history: ConversationHistory,
                  primary_model=None, fallback_model=None, dialect="Egyptian"):
@@ -31,38 +99,63 @@ class RealEstateAgent:
 
         self.knowledge_base = KnowledgeBase()
         self.knowledge_retriever = KnowledgeRetrieval(self.knowledge_base)
+        self._cached_retrieve = functools.lru_cache(maxsize=RETRIEVAL_CACHE_SIZE)(self._retrieve_frozen)
 
         # ✅ Load rule-based reasoning knowledge
-        self.rules = self._load_rules()
+        self.rules = _load_rules()
+        self._budget_advice = self._index_budget_rules()
+        self._feature_ac = self._build_feature_automaton()
+
+        # Response builders per phase, all called as handler(user_info, relevant_knowledge)
+        self._phase_dispatch = {
+            ConversationPhase.DISCOVERY: self._discovery_response,
+            ConversationPhase.SUMMARY: lambda user_info, knowledge: self._summary_response(user_info),
+            ConversationPhase.SUGGESTION: self._suggest_properties,
+            ConversationPhase.PERSUASION: lambda user_info, knowledge: self._persuasion_response(user_info),
+            ConversationPhase.ALTERNATIVE: lambda user_info, knowledge: "ممكن نعرض عليك اختيارات تانية قريبة من اللي بتحبّه.",
+            ConversationPhase.URGENCY: lambda user_info, knowledge: "الفرص دي مش بتستنى! تحب نكمل إجراءات المعاينة؟",
+            ConversationPhase.CLOSING: lambda user_info, knowledge: "تمام، ابعتلي اسمك ورقم تليفونك وهنكلمك في أقرب وقت.",
+        }
 
-    def _load_rules(self):
-        rules_path = os.path.join("knowledge", "rules.json")
-        if os.path.exists(rules_path):
-            with open(rules_path, encoding="utf-8") as f:
-                return json.load(f)
-        else:
-            logger.warning("rules.json not found.")
-            return {}
+    def _index_budget_rules(self) -> List[List[str]]:
+        """Buckets budget advice responses into a list indexed by BudgetCondition."""
+        buckets = [[] for _ in BudgetCondition]
+        for rule in self.rules.get("budget_advice", []):
+            condition = _BUDGET_CONDITIONS.get(rule["condition"])
+            if condition is not None:
+                buckets[condition].append(rule["response"])
+        return buckets
+
+    def _build_feature_automaton(self) -> Optional[ahocorasick.Automaton]:
+        """
+        Builds an automaton over property_priority features; each key maps to the
+        (rule index, response) pairs sharing that feature. Returns None if there are no rules.
+        """
+        automaton = ahocorasick.Automaton()
+        for i, rule in enumerate(self.rules.get("property_priority", [])):
+            matches = automaton.get(rule["feature"], [])
+            automaton.add_word(rule["feature"], matches + [(i, rule["response"])])
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
 
     def process_message(self, user_message: str, state: list = []) -> Tuple[str, list]:
         self.conversation_history.add_user_message(user_message)
+        message_norm = user_message.translate(_NORMALIZE).lower()
 
         logger.info(f"📩 Received message: {user_message}")
         logger.info(f"🔄 Current phase: {self.current_phase}")
         logger.info(f"📌 User info before reasoning: {self.user_info}")
 
-        self._basic_info_extraction(user_message)
+        self._basic_info_extraction(user_message, message_norm)
 
-        relevant_knowledge = self.knowledge_retriever.retrieve(
-            query=user_message,
-            phase=self.current_phase,
-            context={"user_info": self.user_info}
-        )
+        relevant_knowledge = self._retrieve_knowledge(message_norm)
 
         reasoning_result = self.reasoning_engine.analyze(
             message=user_message,
             current_phase=self.current_phase,
-            conversation_history=self.conversation_history.get_all(),
+            conversation_history=self.conversation_history,
             relevant_knowledge=relevant_knowledge,
             context={"user_info": self.user_info}
         )
@@ -72,7 +165,7 @@ class RealEstateAgent:
             self.user_info.update(extracted_info)
 
         # ✅ Handle vague references like "هي مش عاجباني"
-        if self._is_reference_to_previous_property(user_message):
+        if self._is_reference_to_previous_property(user_message, message_norm):
             logger.info("🔎 User is referring to a previously shown property.")
             self.user_info["refers_to"] = self.last_mentioned_property or "غير واضح"
 
@@ -88,61 +181,65 @@ class RealEstateAgent:
 
         return response, state
 
-    def _basic_info_extraction(self, message: str):
-        message_lower = message.lower()
-        locations = [
-            "القاهرة", "الاسكندرية", "الجيزة", "المعادي", "مدينة نصر", "6 أكتوبر", "التجمع",
-            "الشروق", "العبور", "الرحاب", "مدينتي", "الشيخ زايد", "المهندسين", "الدقي",
-            "الزمالك", "وسط البلد", "مصر الجديدة", "حلوان"
-        ]
-        for location in locations:
-            if location in message and "location" not in self.user_info:
-                self.user_info["location"] = location
-                break
-
-        budget_pattern = r'(\d[\d,]*)\s*(جنيه|الف|مليون|k|m)'
-        budget_match = re.search(budget_pattern, message)
-        if budget_match and "budget" not in self.user_info:
-            amount = budget_match.group(1).replace(',', '')
-            unit = budget_match.group(2)
-            budget = f"{amount} {'ألف جنيه' if unit in ['k', 'الف'] else 'مليون جنيه' if unit in ['m', 'مليون'] else 'جنيه'}"
-            self.user_info["budget"] = budget
-
-        property_types = {
-            "شقة": ["شقة", "شقه", "apartment"],
-            "فيلا": ["فيلا", "فيلات", "villa"],
-            "دوبلكس": ["دوبلكس", "duplex"],
-            "ستوديو": ["ستوديو", "studio"],
-            "محل": ["محل", "محلات", "shop"],
-            "مكتب": ["مكتب", "مكاتب", "office"]
-        }
-        for prop_type, keywords in property_types.items():
-            for keyword in keywords:
-                if keyword in message_lower and "property_type" not in self.user_info:
-                    self.user_info["property_type"] = prop_type
-                    break
+    def _retrieve_knowledge(self, message_norm: str) -> dict:
+        """
+        Retrieves knowledge for the current phase, reusing earlier results for the same
+        normalized message, phase and user_info. Cached results are shared between calls
+        and must not be mutated.
+        """
+        try:
+            user_info_key = tuple(sorted(
+                (key, tuple(value) if isinstance(value, list) else value)
+                for key, value in self.user_info.items()
+            ))
+            hash(user_info_key)
+        except TypeError:
+            # user_info holds values that can't be hashed (e.g. a referred property dict)
+            return self._retrieve(message_norm, self.current_phase, self.user_info)
+        return self._cached_retrieve(message_norm, self.current_phase, user_info_key)
+
+    def _retrieve_frozen(self, query: str, phase: ConversationPhase, user_info_key: tuple) -> dict:
+        user_info = {key: list(value) if isinstance(value, tuple) else value for key, value in user_info_key}
+        return self._retrieve(query, phase, user_info)
+
+    def _retrieve(self, query: str, phase: ConversationPhase, user_info: dict) -> dict:
+        return self.knowledge_retriever.retrieve(
+            query=query,
+            phase=phase,
+            context={"user_info": user_info}
+        )
 
-    def _is_reference_to_previous_property(self, message: str) -> bool:
-        vague_words = ['هي', 'ده', 'دي', 'العقار ده', 'العرض ده']
-        reference_patterns = [rf'{word}.*(مش|ما عجبني|ما عجباني|ما عجبها|ما حبيتها)' for word in vague_words]
-        return any(re.search(p, message.lower()) for p in reference_patterns)
+    def _basic_info_extraction(self, message: str, message_norm: str = None):
+        if all(field in self.user_info for field in _BASIC_INFO_FIELDS):
+            return
+
+        if message_norm is None:
+            message_norm = message.translate(_NORMALIZE).lower()
+
+        if "location" not in self.user_info or "property_type" not in self.user_info:
+            for _, (category, value) in _KEYWORD_AC.iter(message_norm):
+                self.user_info.setdefault(category, value)
+
+        if "budget" not in self.user_info:
+            budget_match = _BUDGET_RE.search(message_norm)
+            if budget_match:
+                amount = budget_match.group(1).replace(',', '')
+                unit = budget_match.group(2)
+                budget = f"{amount} {'ألف جنيه' if unit in ['k', 'الف'] else 'مليون جنيه' if unit in ['m', 'مليون'] else 'جنيه'}"
+                self.user_info["budget"] = budget
+
+    def _is_reference_to_previous_property(self, message: str, message_norm: str = None) -> bool:
+        if message_norm is None:
+            message_norm = message.translate(_NORMALIZE).lower()
+        return bool(_REF_RE.search(message_norm))
 
     def _apply_rule_logic(self, user_info: dict, property_data: dict = None) -> List[str]:
         advice = []
 
         # Budget logic
-        budget_value = user_info.get("budget", "")
-        if "مليون" in budget_value:
-            advice += [r["response"] for r in self.rules.get("budget_advice", []) if r["condition"] == "budget_high"]
-        elif "ألف" in budget_value:
-            try:
-                numeric = int(re.findall(r'\d+', budget_value)[0])
-                if numeric < 500:
-                    advice += [r["response"] for r in self.rules.get("budget_advice", []) if r["condition"] == "budget_low"]
-                else:
-                    advice += [r["response"] for r in self.rules.get("budget_advice", []) if r["condition"] == "budget_mid"]
-            except:
-                pass
+        condition = self._budget_condition(user_info.get("budget", ""))
+        if condition is not None:
+            advice += self._budget_advice[condition]
 
         # Feature-based advice
         features = []
@@ -151,36 +248,39 @@ class RealEstateAgent:
         elif "features" in user_info:
             features = user_info["features"]
 
-        for f in features:
-            for rule in self.rules.get("property_priority", []):
-                if rule["feature"] in f:
-                    advice.append(rule["response"])
+        if self._feature_ac is not None:
+            for f in features:
+                # One response per matching rule, in rules.json order
+                hits = {i: response for _, matches in self._feature_ac.iter(f) for i, response in matches}
+                advice.extend(hits[i] for i in sorted(hits))
 
         return advice
 
+    @staticmethod
+    def _budget_condition(budget_value) -> Optional[BudgetCondition]:
+        """Maps a budget string like "300 ألف جنيه" to its budget_advice condition."""
+        if not isinstance(budget_value, str):
+            return None
+        if "مليون" in budget_value:
+            return BudgetCondition.HIGH
+        if "ألف" in budget_value:
+            match = _DIGITS_RE.search(budget_value)
+            if match:
+                return BudgetCondition.LOW if int(match.group()) < 500 else BudgetCondition.MID
+        return None
+
     def _generate_response(self, user_message, reasoning_result, relevant_knowledge={}):
-        phase = self.current_phase
-        user_info = self.user_info
-
-        if phase == ConversationPhase.DISCOVERY:
-            return self._discovery_response(user_info, relevant_knowledge)
-        elif phase == ConversationPhase.SUMMARY:
-            return self._summary_response(user_info)
-        elif phase == ConversationPhase.SUGGESTION:
-            return self._suggest_properties(user_info, relevant_knowledge)
-        elif phase == ConversationPhase.PERSUASION:
-            referred = self.user_info.get("refers_to", None)
-            if referred and isinstance(referred, dict):
-                return f"ليه مش عاجبك؟ ده فيه {referred.get('features', 'مميزات رائعة')} وموقعه في {referred.get('location', 'مكان ممتاز')}."
-            return "ممكن توضح إيه اللي مش عاجبك؟ نقدر نعرض بديل."
-        elif phase == ConversationPhase.ALTERNATIVE:
-            return "ممكن نعرض عليك اختيارات تانية قريبة من اللي بتحبّه."
-        elif phase == ConversationPhase.URGENCY:
-            return "الفرص دي مش بتستنى! تحب نكمل إجراءات المعاينة؟"
-        elif phase == ConversationPhase.CLOSING:
-            return "تمام، ابعتلي اسمك ورقم تليفونك وهنكلمك في أقرب وقت."
+        handler = self._phase_dispatch.get(self.current_phase)
+        if handler:
+            return handler(self.user_info, relevant_knowledge)
         return "أنا هنا أساعدك. تحب تبدأ بإيه؟"
 
+    def _persuasion_response(self, user_info: dict) -> str:
+        referred = user_info.get("refers_to", None)
+        if referred and isinstance(referred, dict):
+            return f"ليه مش عاجبك؟ ده فيه {referred.get('features', 'مميزات رائعة')} وموقعه في {referred.get('location', 'مكان ممتاز')}."
+        return "ممكن توضح إيه اللي مش عاجبك؟ نقدر نعرض بديل."
+
     def _discovery_response(self, user_info: dict, knowledge: dict = {}) -> str:
         missing = []
         if not user_info.get("location"): missing.append("المكان")
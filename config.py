@@ -4,7 +4,7 @@ Contains all configuration parameters and constants.
 """
 
 import os
-from enum import Enum
+from enum import Enum, IntEnum
 from pathlib import Path
 
 # === Paths ===
@@ -34,6 +34,7 @@ EMBEDDING_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-mpnet-base
 CHUNK_SIZE = 512
 CHUNK_OVERLAP = 128
 TOP_K_RETRIEVAL = 3
+RETRIEVAL_CACHE_SIZE = 256
 
 # === UI configurations ===
 GRADIO_THEME = "dark"
@@ -53,3 +54,9 @@ class ConversationPhase(Enum):
     ALTERNATIVE = 5     # Address concerns with alternatives
     URGENCY = 6         # Create urgency
     CLOSING = 7         # Facilitate next steps
+
+# === Budget advice conditions (index into the bucketed budget_advice rules) ===
+class BudgetCondition(IntEnum):
+    HIGH = 0            # Budget in millions
+    MID = 1             # Budget of 500 thousand or more
+    LOW = 2             # Budget under 500 thousand
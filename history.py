@@ -50,6 +50,12 @@ class ConversationHistory:
         """
         return self.history
 
+    def __len__(self):
+        return len(self.history)
+
+    def __iter__(self):
+        return iter(self.history)
+
     def get_history(self):
         """
         Alias for get_all(). Ensures compatibility with existing code.
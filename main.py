@@ -3,7 +3,6 @@ Main entry point for the Arabic Real Estate AI Agent.
 Sets up the Gradio interface and initializes the agent.
 """
 import os
-import gradio as gr
 import logging
 from flask import Flask, render_template, request, jsonify, redirect
 from flask_cors import CORS
@@ -36,50 +35,56 @@ agent = RealEstateAgent(
 )
 
 # === Gradio UI Setup ===
-with gr.Blocks(theme=GRADIO_THEME, css="""
-    .gradio-container {direction: rtl;}
-    .chat-message p {text-align: right;}
-    .chat-message h4 {text-align: right;}
-""") as demo:
-    gr.Markdown(f"# {UI_TITLE}")
-    gr.Markdown(UI_DESCRIPTION)
-
-    chatbot = gr.Chatbot(
-        height=600,
-        show_copy_button=True,
-        avatar_images=(None, "https://img.icons8.com/color/48/000000/property.png"),
-        type="messages"
-    )
+def build_gradio_ui():
+    """Builds the Gradio chat UI. Gradio is imported here so the Flask-only path never loads it."""
+    import gradio as gr
 
-    msg = gr.Textbox(
-        placeholder="اكتب رسالتك هنا...",
-        container=False,
-        scale=7,
-    )
+    with gr.Blocks(theme=GRADIO_THEME, css="""
+        .gradio-container {direction: rtl;}
+        .chat-message p {text-align: right;}
+        .chat-message h4 {text-align: right;}
+    """) as demo:
+        gr.Markdown(f"# {UI_TITLE}")
+        gr.Markdown(UI_DESCRIPTION)
 
-    with gr.Row():
-        submit = gr.Button("إرسال", variant="primary", scale=1)
-        clear = gr.Button("مسح المحادثة", variant="secondary", scale=1)
+        chatbot = gr.Chatbot(
+            height=600,
+            show_copy_button=True,
+            avatar_images=(None, "https://img.icons8.com/color/48/000000/property.png"),
+            type="messages"
+        )
 
-    state = gr.State([])
+        msg = gr.Textbox(
+            placeholder="اكتب رسالتك هنا...",
+            container=False,
+            scale=7,
+        )
 
-    def init_chat():
-        return [{"role": "assistant", "content": UI_WELCOME_MESSAGE}], []
+        with gr.Row():
+            submit = gr.Button("إرسال", variant="primary", scale=1)
+            clear = gr.Button("مسح المحادثة", variant="secondary", scale=1)
 
-    def respond(message, history, state):
-        if not message.strip():
-            return history, state
+        state = gr.State([])
 
-        history.append({"role": "user", "content": message})
-        response, new_state = agent.process_message(message, state)
-        history.append({"role": "assistant", "content": response})
+        def init_chat():
+            return [{"role": "assistant", "content": UI_WELCOME_MESSAGE}], []
+
+        def respond(message, history, state):
+            if not message.strip():
+                return history, state
+
+            history.append({"role": "user", "content": message})
+            response, new_state = agent.process_message(message, state)
+            history.append({"role": "assistant", "content": response})
+
+            return history, new_state
 
-        return history, new_state
+        msg.submit(respond, [msg, chatbot, state], [chatbot, state]).then(lambda: "", None, msg)
+        submit.click(respond, [msg, chatbot, state], [chatbot, state]).then(lambda: "", None, msg)
+        clear.click(init_chat, None, [chatbot, state])
+        demo.load(init_chat, None, [chatbot, state])
 
-    msg.submit(respond, [msg, chatbot, state], [chatbot, state]).then(lambda: "", None, msg)
-    submit.click(respond, [msg, chatbot, state], [chatbot, state]).then(lambda: "", None, msg)
-    clear.click(init_chat, None, [chatbot, state])
-    demo.load(init_chat, None, [chatbot, state])
+    return demo
 
 # === Flask App Setup ===
 app = Flask(__name__)
@@ -124,6 +129,7 @@ def gradio_interface():
 
 # === Run App ===
 if __name__ == "__main__":
+    demo = build_gradio_ui()
     demo.launch(
         server_name="0.0.0.0",
         server_port=5000,
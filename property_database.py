@@ -1,27 +1,50 @@
-import pandas as pd
+import os
 
 class RealEstateListings:
     def __init__(self, csv_path: str):
+        if not os.path.exists(csv_path):
+            self.df = None
+            print(f"⚠️ CSV file not found at: {csv_path}. No listings loaded.")
+            return
+
+        # numpy/pandas are imported lazily so a missing listings CSV never pays their import cost
+        import numpy as np
+        import pandas as pd
+
         try:
             self.df = pd.read_csv(csv_path)
-        except FileNotFoundError:
-            self.df = pd.DataFrame()
-            print(f"⚠️ CSV file not found at: {csv_path}. Using empty DataFrame.")
         except Exception as e:
             self.df = pd.DataFrame()
             print(f"⚠️ Error loading listings CSV: {e}")
 
-    def search(self, filters: dict) -> list:
-        results = self.df.copy()
+        if not self.df.empty:
+            # Coerce numeric columns once so searches and results share the parsed values
+            self.df['price'] = pd.to_numeric(self.df['price'], errors='coerce')
+            self.df['bedrooms'] = pd.to_numeric(self.df['bedrooms'], errors='coerce').astype('Int64')
+
+            # Column arrays used to filter candidates per search
+            self._loc = self.df['location'].fillna("").astype(str).str.lower().to_numpy(dtype=str)
+            self._type = self.df['type'].fillna("").astype(str).str.lower().to_numpy(dtype=str)
+            self._price = self.df['price'].to_numpy(dtype=float)
+            self._beds = self.df['bedrooms'].to_numpy(dtype=float, na_value=np.nan)
 
-        if self.df.empty:
+            # Row indices ordered by price (NaN last) for O(log n) budget cuts
+            self._price_sorted = np.argsort(self._price, kind='stable')
+            self._price_sorted_vals = self._price[self._price_sorted]
+
+    def search(self, filters: dict) -> list:
+        if self.df is None or self.df.empty:
             return []
 
-        if 'location' in filters:
-            results = results[results['location'].str.contains(filters['location'], case=False, na=False)]
+        # Return top 3 matching rows as dictionaries
+        return self.df.iloc[self._match_indices(filters)[:3]].to_dict(orient="records")
 
-        if 'property_type' in filters:
-            results = results[results['type'].str.contains(filters['property_type'], case=False, na=False)]
+    def _match_indices(self, filters: dict):
+        """Returns the row positions matching `filters`, in original row order."""
+        import numpy as np
+
+        # Candidate row indices, kept in original row order
+        candidates = None
 
         if 'budget' in filters:
             try:
@@ -32,15 +55,26 @@ class RealEstateListings:
                     else filters['budget']
                 )
                 budget = int(str(budget_value).replace(",", "").strip())
-                results = results[pd.to_numeric(results['price'], errors='coerce') <= budget]
+                cut = np.searchsorted(self._price_sorted_vals, budget, side='right')
+                candidates = np.sort(self._price_sorted[:cut])
             except Exception as e:
                 print(f"⚠️ Could not parse budget: {filters.get('budget')} → {e}")
 
+        if candidates is None:
+            candidates = np.arange(len(self.df))
+
+        if 'location' in filters:
+            location = str(filters['location']).lower()
+            candidates = candidates[np.char.find(self._loc[candidates], location) >= 0]
+
+        if 'property_type' in filters:
+            property_type = str(filters['property_type']).lower()
+            candidates = candidates[np.char.find(self._type[candidates], property_type) >= 0]
+
         if 'bedrooms' in filters:
             try:
-                results = results[results['bedrooms'] == int(filters['bedrooms'])]
+                candidates = candidates[self._beds[candidates] == int(filters['bedrooms'])]
             except Exception:
                 pass
 
-        # Return top 3 matching rows as dictionaries
-        return results.head(3).to_dict(orient="records")
+        return candidates
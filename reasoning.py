@@ -5,7 +5,7 @@ Implements chain-of-thought reasoning to make decisions based on the conversatio
 
 import logging
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sized
 
 from config import ConversationPhase, DEBUG
 from utils.text_processing import (
@@ -72,7 +72,7 @@ class Reasoning:
         }
 
     def analyze(self, message: str, current_phase: ConversationPhase,
-                conversation_history: List[Dict], relevant_knowledge: Dict, context: Dict) -> Dict:
+                conversation_history: Sized, relevant_knowledge: Dict, context: Dict) -> Dict:
         logger.debug(f"Analyzing message in phase {current_phase.name}")
 
         # Fallback: user wants to go back
@@ -124,7 +124,7 @@ class Reasoning:
             'relevant_knowledge': {}
         }
 
-    def run(self, message: str, current_phase: ConversationPhase, history: List[Dict],
+    def run(self, message: str, current_phase: ConversationPhase, history: Sized,
             knowledge: Dict = {}, context: Dict = {}) -> Dict:
         return self.analyze(message, current_phase, history, knowledge, context)
 
@@ -150,7 +150,7 @@ class Reasoning:
         return extracted_info
 
     def _check_phase_transition(self, current_phase: ConversationPhase, message: str,
-                                extracted_info: Dict, conversation_history: List[Dict],
+                                extracted_info: Dict, conversation_history: Sized,
                                 context: Dict) -> tuple:
         rules = self.phase_transition_rules.get(current_phase, {})
         if not rules:
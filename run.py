@@ -1,13 +1,17 @@
 """
 This script launches the Arabic Real Estate AI Agent using Flask's development server.
+For production, serve the app with a WSGI server instead, e.g. `gunicorn -w 4 main:app`.
 """
 
 import os
-from app import app
+from main import app
 
 if __name__ == "__main__":
-    # Determine debug mode from environment variable (default is True)
-    debug_mode = os.environ.get("DEBUG", "true").lower() in ["1", "true", "yes"]
+    # Determine debug mode from environment variable (default is False)
+    debug_mode = os.environ.get("DEBUG", "false").lower() in ["1", "true", "yes"]
+
+    if not debug_mode:
+        print("⚠️ Flask's development server is not meant for production. Use a WSGI server, e.g. gunicorn -w 4 main:app")
 
     # Run Flask application
     app.run(